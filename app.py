@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
-from smart_sauna_map.api import app
+from smart_sauna_map.api import app, warm_up
 
 if __name__ == "__main__":
+    warm_up.start()
     app.run(debug=False)
@@ -0,0 +1,25 @@
+import gc
+
+from smart_sauna_map.searchers.registry import load_searchers
+
+# NOTE: The app is imported once in the master and the workers are forked from
+# it, so read-only state built at import time is shared copy-on-write.
+preload_app = True
+
+
+def when_ready(server):
+    load_searchers()
+
+
+def post_worker_init(worker):
+    # NOTE: Threads must not be started in the master; they would not survive
+    # the fork, and locks they hold would stay locked in the workers.
+    from smart_sauna_map.api import warm_up
+
+    warm_up.start()
+
+
+def pre_fork(server, worker):
+    # NOTE: Keep the garbage collector of the workers from touching (and thus
+    # copying) the objects inherited from the master.
+    gc.freeze()
@@ -1,18 +1,43 @@
 # -*- coding: utf-8 -*-
+from __future__ import annotations
 
+from dataclasses import asdict
 from typing import Optional
 
 from flask import Flask, abort, jsonify, make_response, request
 from flask_cors import CORS  # type: ignore
 
+from smart_sauna_map.catalog import catalog
+from smart_sauna_map.compression import compress_response
 from smart_sauna_map.geocoding import geocode as _geocode
+from smart_sauna_map.nearby import NearbyIndex
 from smart_sauna_map.search_sauna import search_sauna as _search_sauna
 from smart_sauna_map.searchers.abstract_searcher import AbstractSearcher
-from smart_sauna_map.searchers.google_map_searcher import GoogleMapSearcher
-from smart_sauna_map.searchers.sauna_ikitai_searcher import SaunaIkitaiSearcher
+from smart_sauna_map.searchers.registry import get_searcher
+from smart_sauna_map.serialization import (
+    MIMETYPE_JSON,
+    MIMETYPE_MSGPACK,
+    compact,
+    compact_delta,
+    msgpack_available,
+    pack,
+)
+from smart_sauna_map.snapshots import SnapshotStore
+from smart_sauna_map.tiles import TileIndex
+from smart_sauna_map.warmup import WarmUp
 
 app = Flask(__name__, static_folder="./build/static", template_folder="./build")
 CORS(app)  # Cross Origin Resource Sharing
+# NOTE: Started per worker by gunicorn.conf.py (or app.py), not at import, so
+# that no thread is running in the gunicorn master when it forks.
+warm_up = WarmUp.from_file()
+snapshots = SnapshotStore()
+tiles = TileIndex()
+catalog.add_index(tiles)
+nearby_index = NearbyIndex()
+catalog.add_index(nearby_index)
+
+MAX_NEARBY = 100
 
 
 @app.route("/geocode", methods=["POST"])
@@ -42,6 +67,17 @@ def geocode():
 def search_sauna():
     """Search sauna list.
 
+    The request may set ``"compact": true`` to receive the compact wire format
+    (see ``smart_sauna_map.serialization.compact``), and may send
+    ``Accept: application/x-msgpack`` to receive MessagePack instead of JSON.
+
+    The version of the result set is returned in the ``X-Result-Version``
+    header. A client that sends it back as ``"since"`` receives only the saunas
+    added, changed or removed since that version
+    (see ``smart_sauna_map.snapshots.SnapshotStore.delta``).
+
+    Hit saunas are added to the sauna catalog used by ``/tiles`` and ``/nearby``.
+
     Returns:
         Hit saunas with JSON format.
 
@@ -54,22 +90,123 @@ def search_sauna():
             ...,
         ]
     """
+    request_json: dict = request.get_json()
+    keyword: str = request_json["keyword"]
+    searcher: AbstractSearcher = get_searcher(request_json.get("searcher", ""))
+    sauna = _search_sauna(keyword=keyword, searcher=searcher)
+    records = [asdict(s) for s in sauna]
+    is_compact = request_json.get("compact", False)
+
+    since: Optional[str] = request_json.get("since", None)
+    if since is not None:
+        delta = snapshots.delta(since, records)
+        response = _make_negotiated_response(
+            compact_delta(delta) if is_compact else delta
+        )
+        version = delta["version"]
+    else:
+        response = _make_negotiated_response(compact(sauna) if is_compact else records)
+        version = snapshots.put(records)
+
+    response.headers["X-Result-Version"] = version
+    return response
+
+
+@app.route("/nearby", methods=["POST"])
+def nearby():
+    """Return the saunas nearest to given coordinate.
+
+    Saunas are looked up among those found by earlier searches, without any
+    upstream call. The request may set ``"k"`` (defaults to 10, at most 100),
+    ``"min_ikitai"`` and ``"open_now"`` (a JSON boolean); ``open_now`` keeps
+    only saunas whose service hours for today are known and include the
+    current time.
+
+    Returns:
+        Nearest saunas with the distance in km, nearest first, with JSON format.
+
+    Examples:
+        >>> curl -X POST -H "Content-type: application/json" \
+            -d '{"lat": 35.6909, "lng": 139.7003, "k": 2}' http://127.0.0.1:5000/nearby
+        [
+            {"address":"xxxxx","distance_km":0.41,"ikitai":3366,"name":"xxxx",...},
+            {"address":"xxxxx","distance_km":0.52,"ikitai":1045,"name":"xxxx",...},
+        ]
+    """
+    request_json: dict = request.get_json()
+    try:
+        lat = float(request_json["lat"])
+        lng = float(request_json["lng"])
+        if not (-90.0 <= lat <= 90.0 and -180.0 <= lng <= 180.0):
+            # NOTE: Also rejects NaN, which fails every comparison.
+            raise ValueError(f"invalid coordinate: {lat}, {lng}")
+        k = min(int(request_json.get("k", 10)), MAX_NEARBY)
+        min_ikitai: Optional[float] = request_json.get("min_ikitai", None)
+        if min_ikitai is not None:
+            min_ikitai = float(min_ikitai)
+        open_now = request_json.get("open_now", False)
+        if not isinstance(open_now, bool):
+            raise TypeError(f"open_now must be a boolean, but got {open_now!r}.")
+    except (KeyError, TypeError, ValueError):
+        abort(400)
+
+    saunas = nearby_index.nearest(lat, lng, k, min_ikitai=min_ikitai, open_now=open_now)
+    return _make_negotiated_response(
+        [{**asdict(s), "distance_km": d} for d, s in saunas]
+    )
+
+
+@app.route("/tiles/<int:z>/<int:x>/<int:y>", methods=["GET"])
+def tile(z: int, x: int, y: int):
+    """Return clustered saunas in a map tile.
+
+    Below zoom level ``smart_sauna_map.tiles.INDIVIDUAL_ZOOM`` the tile holds
+    clusters of the saunas found so far; at and above it, individual saunas.
+
+    Returns:
+        Clusters and saunas in the tile with JSON format.
 
-    def _select_searcher(searcher_name: str) -> AbstractSearcher:
-        name2obj = {
-            "SaunaIkitaiSearcher": SaunaIkitaiSearcher(),
-            "GoogleMapSearcher": GoogleMapSearcher(),
+    Examples:
+        >>> curl http://127.0.0.1:5000/tiles/5/28/12
+        {
+            "clusters": [{"count":42,"lat":35.68,"lng":139.72,"max_ikitai":8949}, ...],
+            "saunas": [],
+            "x": 28, "y": 12, "z": 5
         }
-        return name2obj.get(searcher_name, SaunaIkitaiSearcher())
+    """
+    try:
+        payload = tiles.tile(z, x, y)
+    except ValueError:
+        abort(404)
+    return _make_negotiated_response(payload)
 
-    keyword: str = request.get_json()["keyword"]
-    searcher: str = _select_searcher(request.get_json().get("searcher", ""))
-    sauna = _search_sauna(keyword=keyword, searcher=searcher)
-    return make_response(jsonify(sauna))
+
+@app.route("/status", methods=["GET"])
+def status():
+    """Return the state of background work such as cache warm-up.
+
+    Examples:
+        >>> curl http://127.0.0.1:5000/status
+        {"warmup":{"completed":2,"elapsed_seconds":5.2,"failed":0,"finished":true,"total":2}}
+    """
+    return make_response(jsonify({"warmup": warm_up.status()}))
+
+
+def _make_negotiated_response(payload: dict | list):
+    """Encode payload with MessagePack if the client prefers it, JSON otherwise."""
+    mimetype = request.accept_mimetypes.best_match([MIMETYPE_JSON, MIMETYPE_MSGPACK])
+    if mimetype == MIMETYPE_MSGPACK and msgpack_available():
+        response = make_response(pack(payload))
+        response.mimetype = MIMETYPE_MSGPACK
+    else:
+        response = make_response(jsonify(payload))
+    response.vary.add("Accept")
+    return response
 
 
 @app.after_request
 def after_request(response):
     response.headers.add("Access-Control-Allow-Headers", "Content-Type,Authorization")
     response.headers.add("Access-Control-Allow-Methods", "POST,OPTIONS")
-    return response
+    response.headers.add("Access-Control-Expose-Headers", "X-Result-Version")
+    return compress_response(response, request.accept_encodings)
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Any, Iterable, Optional
+
+from smart_sauna_map.data_models.sauna import Sauna
+
+__all__ = ["AbstractIndex", "SaunaCatalog", "catalog"]
+
+
+class AbstractIndex(ABC):
+    """Index over the saunas of a catalog, kept up to date incrementally."""
+
+    @abstractmethod
+    def update(self, old: Optional[Sauna], new: Sauna) -> None:
+        """Replace ``old`` (``None`` for a new sauna) with ``new``."""
+        pass
+
+    def seen(self, sauna: Sauna, at: datetime) -> None:
+        """Called for every sauna upserted at ``at``, changed or not."""
+        pass
+
+
+class SaunaCatalog:
+    """Every sauna with coordinates seen so far, keyed by ``sauna_id``.
+
+    Saunas found by any search are stored here so that map features can be
+    served without calling upstream services. Indexes added with
+    ``add_index`` are notified of every sauna added or changed.
+    """
+
+    def __init__(self):
+        self._saunas: dict[Any, Sauna] = {}
+        self._indexes: list[AbstractIndex] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._saunas)
+
+    def get(self, sauna_id: Any) -> Optional[Sauna]:
+        return self._saunas.get(sauna_id)
+
+    def add_index(self, index: AbstractIndex) -> None:
+        with self._lock:
+            for sauna in self._saunas.values():
+                index.update(None, sauna)
+            self._indexes.append(index)
+
+    def upsert(self, saunas: Iterable[Sauna], at: Optional[datetime] = None) -> None:
+        """Add new saunas and replace changed ones. Saunas without coordinates
+        are ignored.
+
+        Args:
+            saunas: Saunas just received from a searcher.
+            at: When the saunas were received. Defaults to now.
+        """
+        at = at or datetime.now(timezone.utc)
+        with self._lock:
+            for sauna in saunas:
+                if sauna.lat is None or sauna.lng is None:
+                    continue
+                old = self._saunas.get(sauna.sauna_id)
+                if old != sauna:
+                    self._saunas[sauna.sauna_id] = sauna
+                    for index in self._indexes:
+                        index.update(old, sauna)
+                for index in self._indexes:
+                    index.seen(sauna, at)
+
+
+catalog = SaunaCatalog()
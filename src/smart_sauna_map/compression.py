@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import gzip
+import os
+
+from flask import Response
+from werkzeug.datastructures import Accept
+
+try:
+    import brotli  # type: ignore
+except ImportError:  # pragma: no cover
+    brotli = None
+
+__all__ = ["compress_response"]
+
+COMPRESS_MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", 500))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def compress_response(
+    response: Response, accept_encodings: Accept, *, min_size: int = COMPRESS_MIN_SIZE
+) -> Response:
+    """Compress response body with the best encoding the client accepts.
+
+    Brotli is preferred over gzip when the ``brotli`` package is installed.
+    Bodies smaller than ``min_size`` bytes are sent as they are.
+
+    Args:
+        response: Response to compress in place.
+        accept_encodings: Parsed ``Accept-Encoding`` header of the request.
+        min_size: Smallest body size in bytes worth compressing.
+
+    Returns:
+        The given response.
+    """
+    if (
+        response.direct_passthrough
+        or not 200 <= response.status_code < 300
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+
+    data = response.get_data()
+    if len(data) < min_size:
+        return response
+
+    response.vary.add("Accept-Encoding")
+    encoding = accept_encodings.best_match(_supported_encodings())
+    if encoding is None:
+        return response
+
+    response.set_data(_compress(data, encoding))
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def _supported_encodings() -> list[str]:
+    return ["br", "gzip"] if brotli else ["gzip"]
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
@@ -2,23 +2,28 @@
 
 from __future__ import annotations
 
-import os
-from os.path import dirname, join
+from functools import cache
 
-import geopy
-from dotenv import load_dotenv
+from smart_sauna_map import upstream
+from smart_sauna_map.settings import google_map_api_key
 
-load_dotenv(dotenv_path=join(dirname(__file__), ".env"))
 
-GOOGLE_MAP_API_KEY = os.environ.get("GOOGLE_MAP_API_KEY")
+@cache
+def geocode(query: str, *, timeout: float = 30.0) -> dict[str, float | None]:
+    return upstream.transport.call(
+        "geocode", {"query": query}, lambda: _geocode(query, timeout=timeout)
+    )
 
 
-def geocode(query: str, *, timeout: float = 30.0) -> dict[str, float | None]:
+def _geocode(query: str, *, timeout: float) -> dict[str, float | None]:
+    from geopy.exc import GeocoderQueryError
+    from geopy.geocoders import GoogleV3
+
     try:
-        location = geopy.geocoders.GoogleV3(
-            api_key=GOOGLE_MAP_API_KEY, domain="maps.google.co.jp", timeout=timeout
+        location = GoogleV3(
+            api_key=google_map_api_key(), domain="maps.google.co.jp", timeout=timeout
         ).geocode(query)
-    except geopy.exc.GeocoderQueryError:
+    except GeocoderQueryError:
         return {"lat": None, "lng": None}
 
     if not location:
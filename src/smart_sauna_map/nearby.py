@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import heapq
+import math
+import threading
+from datetime import date, datetime
+from typing import Any, Callable, Optional
+
+from smart_sauna_map.catalog import AbstractIndex
+from smart_sauna_map.data_models.sauna import Sauna
+from smart_sauna_map.opening_hours import TIMEZONE, is_open
+
+__all__ = ["NearbyIndex", "haversine_km"]
+
+EARTH_RADIUS_KM = 6371.0088
+# Size of a grid cell in degrees of latitude and longitude (about 11 km).
+CELL_DEGREES = 0.1
+
+CellKey = tuple[int, int]
+
+
+def haversine_km(
+    lat: float, lng: float, lats: list[float], lngs: list[float]
+) -> list[float]:
+    """Return great-circle distances in km from one point to many points,
+    evaluated as one vectorized numpy expression."""
+    # NOTE: Imported on first use to keep the startup of the API fast.
+    import numpy as np
+
+    phi1, lambda1 = np.radians(lat), np.radians(lng)
+    phi2, lambda2 = np.radians(lats), np.radians(lngs)
+    a = (
+        np.sin((phi2 - phi1) / 2) ** 2
+        + np.cos(phi1) * np.cos(phi2) * np.sin((lambda2 - lambda1) / 2) ** 2
+    )
+    return (2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))).tolist()
+
+
+def _coordinates(sauna: Sauna) -> tuple[float, float]:
+    # NOTE: SaunaCatalog only notifies indexes of saunas with coordinates.
+    assert sauna.lat is not None and sauna.lng is not None
+    return sauna.lat, sauna.lng
+
+
+def _cell_of(lat: float, lng: float) -> CellKey:
+    return math.floor(lat / CELL_DEGREES), math.floor(lng / CELL_DEGREES)
+
+
+def _lower_bound_km(lat: float, r: int) -> float:
+    """Lower bound of the distance from a point to any point outside the
+    (2r + 1) x (2r + 1) cells around the cell containing it."""
+    if r == 0:
+        return 0.0
+    delta = math.radians(r * CELL_DEGREES)
+    # NOTE: The distance to a meridian ``delta`` away is asin(cos(lat) sin(delta)).
+    by_lat = EARTH_RADIUS_KM * delta
+    by_lng = EARTH_RADIUS_KM * math.asin(
+        min(1.0, math.cos(math.radians(lat)) * math.sin(min(delta, math.pi / 2)))
+    )
+    return min(by_lat, by_lng)
+
+
+class NearbyIndex(AbstractIndex):
+    """Grid index of sauna coordinates for nearest-sauna queries.
+
+    Examples:
+        >>> nearby = NearbyIndex()
+        >>> catalog.add_index(nearby)
+        >>> nearby.nearest(35.6909, 139.7003, k=1)
+        [(0.41, Sauna(sauna_id=1821, name='新宿天然温泉 テルマー湯', ...))]
+    """
+
+    def __init__(self):
+        self._saunas: dict[Any, Sauna] = {}
+        self._cells: dict[CellKey, set[Any]] = {}
+        # Day (in TIMEZONE) on which the service hours of each sauna were seen.
+        self._seen_on: dict[Any, date] = {}
+        self._lock = threading.Lock()
+
+    def update(self, old: Optional[Sauna], new: Sauna) -> None:
+        with self._lock:
+            if old is not None:
+                cell = _cell_of(*_coordinates(old))
+                self._cells[cell].discard(old.sauna_id)
+                if not self._cells[cell]:
+                    del self._cells[cell]
+            self._saunas[new.sauna_id] = new
+            cell = _cell_of(*_coordinates(new))
+            self._cells.setdefault(cell, set()).add(new.sauna_id)
+
+    def seen(self, sauna: Sauna, at: datetime) -> None:
+        with self._lock:
+            self._seen_on[sauna.sauna_id] = at.astimezone(TIMEZONE).date()
+
+    def nearest(
+        self,
+        lat: float,
+        lng: float,
+        k: int = 10,
+        *,
+        min_ikitai: Optional[float] = None,
+        open_now: bool = False,
+        now: Optional[datetime] = None,
+    ) -> list[tuple[float, Sauna]]:
+        """Return the k saunas nearest to a coordinate.
+
+        Cells are searched in rings of growing radius around the cell of the
+        coordinate, until the k-th distance found is within the lower bound of
+        the distance to the cells not searched yet.
+
+        Args:
+            lat: Latitude of the user.
+            lng: Longitude of the user.
+            k: Number of saunas to return.
+            min_ikitai: Skip saunas whose ikitai is less than this.
+            open_now: Skip saunas not known to be open now. The service hours
+                of a sauna are only used on the day they were seen.
+            now: Time for ``open_now``. Defaults to the current time in
+                ``smart_sauna_map.opening_hours.TIMEZONE``.
+
+        Returns:
+            Pairs of the distance in km and the sauna, nearest first.
+        """
+        predicates: list[Callable[[Sauna], bool]] = []
+        if min_ikitai is not None:
+            predicates.append(lambda s: s.ikitai >= min_ikitai)
+        if open_now:
+            at = now or datetime.now(TIMEZONE)
+            today = at.astimezone(TIMEZONE).date()
+            predicates.append(
+                lambda s: self._seen_on.get(s.sauna_id) == today
+                and bool(is_open(s, at))
+            )
+
+        with self._lock:
+            return self._nearest(lat, lng, k, predicates)
+
+    def _nearest(
+        self,
+        lat: float,
+        lng: float,
+        k: int,
+        predicates: list[Callable[[Sauna], bool]],
+    ) -> list[tuple[float, Sauna]]:
+        if k <= 0:
+            return []
+        ci, cj = _cell_of(lat, lng)
+        found: list[tuple[float, Any]] = []
+        n_searched = 0
+        r = 0
+        while n_searched < len(self._cells):
+            if 8 * r >= len(self._cells) - n_searched:
+                # NOTE: Sparse around here; scanning the remaining cells is cheaper.
+                cells = [
+                    c for c in self._cells if max(abs(c[0] - ci), abs(c[1] - cj)) >= r
+                ]
+            else:
+                cells = [c for c in _ring(ci, cj, r) if c in self._cells]
+            n_searched += len(cells)
+
+            saunas = [
+                self._saunas[i]
+                for c in cells
+                for i in self._cells[c]
+                if all(p(self._saunas[i]) for p in predicates)
+            ]
+            coordinates = [_coordinates(s) for s in saunas]
+            distances = haversine_km(
+                lat, lng, [c[0] for c in coordinates], [c[1] for c in coordinates]
+            )
+            found = heapq.nsmallest(
+                k,
+                found + [(d, s.sauna_id) for d, s in zip(distances, saunas)],
+                key=lambda f: f[0],
+            )
+            if len(found) == k and found[-1][0] <= _lower_bound_km(lat, r):
+                break
+            r += 1
+
+        return [(d, self._saunas[i]) for d, i in found]
+
+
+def _ring(ci: int, cj: int, r: int) -> list[CellKey]:
+    if r == 0:
+        return [(ci, cj)]
+    top_bottom = [(ci + di, cj + dj) for di in (-r, r) for dj in range(-r, r + 1)]
+    left_right = [(ci + di, cj + dj) for dj in (-r, r) for di in range(-r + 1, r)]
+    return top_bottom + left_right
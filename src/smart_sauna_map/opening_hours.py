@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import re
+from datetime import datetime
+from functools import cache
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from smart_sauna_map.data_models.sauna import Sauna
+
+__all__ = ["SERVICE_HOURS_PREFIX", "TIMEZONE", "is_open", "parse_service_hours"]
+
+# NOTE: Prefix of the description written by GoogleMapSearcher._get_service_hours.
+SERVICE_HOURS_PREFIX = "本日の営業時間: "
+# Service hours are in the local time of the saunas.
+TIMEZONE = ZoneInfo("Asia/Tokyo")
+
+MINUTES_PER_DAY = 24 * 60
+
+_RANGE = re.compile(r"(\d+)時(\d+)分\s*[～〜~-]\s*翌?(\d+)時(\d+)分")
+
+
+@cache
+def parse_service_hours(text: str) -> Optional[tuple[tuple[int, int], ...]]:
+    """Parse today's service hours into ranges of minutes since midnight.
+
+    Args:
+        text: Service hours such as "5時30分～22時00分", "24時間営業" or "定休日".
+
+    Returns:
+        Opening and closing minutes of each range, an empty tuple if closed
+        today, or None if unknown. A closing time not after the opening time
+        means the range runs past midnight.
+
+    Examples:
+        >>> parse_service_hours("5時30分～22時00分")
+        ((330, 1320),)
+    """
+    if "24時間営業" in text:
+        return ((0, MINUTES_PER_DAY),)
+    if "定休日" in text:
+        return ()
+
+    ranges = tuple(
+        (int(h1) * 60 + int(m1), int(h2) * 60 + int(m2))
+        for h1, m1, h2, m2 in _RANGE.findall(text)
+    )
+    return ranges or None
+
+
+def is_open(sauna: Sauna, now: datetime) -> Optional[bool]:
+    """Return whether a sauna is open at ``now``, assuming that its service
+    hours are for the day of ``now`` in ``TIMEZONE``.
+
+    Args:
+        sauna: Sauna whose description may hold today's service hours.
+        now: Time to check. Naive times are taken as the local time.
+
+    Returns:
+        None if the service hours of the sauna are unknown.
+    """
+    for description in sauna.description or []:
+        if description.startswith(SERVICE_HOURS_PREFIX):
+            ranges = parse_service_hours(description[len(SERVICE_HOURS_PREFIX) :])
+            break
+    else:
+        return None
+
+    if ranges is None:
+        return None
+    now = now.astimezone(TIMEZONE)
+    minute = now.hour * 60 + now.minute
+    return any(
+        start <= minute < end if start < end else (minute >= start or minute < end)
+        for start, end in ranges
+    )
@@ -4,9 +4,10 @@ from __future__ import annotations
 from functools import cache
 from typing import Optional
 
+from smart_sauna_map.catalog import catalog
 from smart_sauna_map.data_models.sauna import Sauna
 from smart_sauna_map.searchers.abstract_searcher import AbstractSearcher
-from smart_sauna_map.searchers.sauna_ikitai_searcher import SaunaIkitaiSearcher
+from smart_sauna_map.searchers.registry import DEFAULT_SEARCHER, get_searcher
 
 __all__ = ["search_sauna"]
 
@@ -14,13 +15,16 @@ __all__ = ["search_sauna"]
 @cache
 def search_sauna(
     keyword: Optional[str] = "しきじ",
-    searcher: AbstractSearcher = SaunaIkitaiSearcher(),
+    searcher: Optional[AbstractSearcher] = None,
 ) -> list[Sauna]:
     """Get sauna information from sauna-ikitai.com with given parameters.
 
+    Hit saunas are also stored in the sauna catalog.
+
     Args:
         keyword: Search word to get sauna list. Defaults to "富士".
-        searcher: Instance of searcher object.
+        searcher: Instance of searcher object. Defaults to the shared
+            ``SaunaIkitaiSearcher``.
 
     Returns:
         List of sauna objects which contain the name, the address, the ikitai.
@@ -46,4 +50,8 @@ def search_sauna(
             )
         ]
     """
-    return searcher.search_sauna(keyword=keyword)
+    if searcher is None:
+        searcher = get_searcher(DEFAULT_SEARCHER)
+    saunas = searcher.search_sauna(keyword=keyword)
+    catalog.upsert(saunas)
+    return saunas
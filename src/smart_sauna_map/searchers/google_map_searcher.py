@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import os
 from datetime import datetime
 from functools import cache
 from typing import Optional
@@ -8,16 +7,26 @@ from typing import Optional
 import googlemaps
 from requests.exceptions import HTTPError
 
+from smart_sauna_map import upstream
 from smart_sauna_map.data_models.room import MansRoom, WomansRoom
 from smart_sauna_map.data_models.sauna import Sauna
+from smart_sauna_map.opening_hours import SERVICE_HOURS_PREFIX, TIMEZONE
 from smart_sauna_map.searchers.abstract_searcher import AbstractSearcher
-
-GOOGLE_MAP_API_KEY = os.environ.get("GOOGLE_MAP_API_KEY")
+from smart_sauna_map.settings import google_map_api_key
 
 
 class GoogleMapSearcher(AbstractSearcher):
     def __init__(self):
-        self.gmaps = googlemaps.Client(key=GOOGLE_MAP_API_KEY)
+        self.api_key = google_map_api_key()
+        self._gmaps: Optional[googlemaps.Client] = None
+
+    @property
+    def gmaps(self) -> googlemaps.Client:
+        # NOTE: Created on first live call so that replaying from the upstream
+        # archive works without an API key.
+        if self._gmaps is None:
+            self._gmaps = googlemaps.Client(key=self.api_key)
+        return self._gmaps
 
     @cache
     def search_sauna(
@@ -62,9 +71,21 @@ class GoogleMapSearcher(AbstractSearcher):
         return [self._cast_to_sauna(sauna) for sauna in saunas]
 
     def _search_sauna(self, keyword: str) -> list[dict]:
-        response = self.gmaps.places(f"{keyword} サウナ", language="ja")
+        query = f"{keyword} サウナ"
+        response = upstream.transport.call(
+            "gmaps.places",
+            {"query": query},
+            lambda: self.gmaps.places(query, language="ja"),
+        )
         return response["results"]
 
+    def _place(self, place_id: str) -> dict:
+        return upstream.transport.call(
+            "gmaps.place",
+            {"place_id": place_id},
+            lambda: self.gmaps.place(place_id, language="ja"),
+        )
+
     def _is_abnormal_query(self, query: str) -> bool:
         max_query_length = 20  # NOTE: WIP
 
@@ -99,7 +120,7 @@ class GoogleMapSearcher(AbstractSearcher):
         )
 
     def _get_image(self, place_id: str) -> str:
-        response = self.gmaps.place(place_id, language="ja")
+        response = self._place(place_id)
         photo_reference = (
             response["result"]["photos"][0]["photo_reference"]
             if "photos" in response["result"]
@@ -108,7 +129,7 @@ class GoogleMapSearcher(AbstractSearcher):
 
         return (
             "https://maps.googleapis.com/maps/api/place/photo"
-            + f"?maxwidth=400&photoreference={photo_reference}&key={GOOGLE_MAP_API_KEY}"
+            + f"?maxwidth=400&photoreference={photo_reference}&key={self.api_key}"
         )
 
     def _get_service_hours(self, place_id: str, *, weekday_id: int = -1) -> str:
@@ -116,7 +137,7 @@ class GoogleMapSearcher(AbstractSearcher):
             f"{weekday}: 記載なし"
             for weekday in ["月曜日", "火曜日", "水曜日", "木曜日", "金曜日", "土曜日", "日曜日"]
         ]
-        response = self.gmaps.place(place_id, language="ja")
+        response = self._place(place_id)
         weekday_text = (
             response["result"]["current_opening_hours"]["weekday_text"]
             if "current_opening_hours" in response["result"]
@@ -125,10 +146,10 @@ class GoogleMapSearcher(AbstractSearcher):
         )
 
         today_service_hours_with_prefix = weekday_text[
-            weekday_id if weekday_id != -1 else datetime.now().weekday()
+            weekday_id if weekday_id != -1 else datetime.now(TIMEZONE).weekday()
         ]
         today_service_hours = today_service_hours_with_prefix.split()[1]
         if today_service_hours == "24":
             today_service_hours = "24時間営業"
 
-        return "本日の営業時間: " + today_service_hours
+        return SERVICE_HOURS_PREFIX + today_service_hours
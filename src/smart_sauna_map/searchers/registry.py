@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from functools import cache
+from importlib import import_module
+
+from smart_sauna_map.searchers.abstract_searcher import AbstractSearcher
+
+__all__ = ["DEFAULT_SEARCHER", "get_searcher", "load_searchers"]
+
+DEFAULT_SEARCHER = "SaunaIkitaiSearcher"
+
+# NOTE: Backends are referred to by module path so that they and their heavy
+# dependencies (bs4, requests, googlemaps, ...) are imported on first use.
+NAME2PATH: dict[str, str] = {
+    "SaunaIkitaiSearcher": "smart_sauna_map.searchers.sauna_ikitai_searcher",
+    "GoogleMapSearcher": "smart_sauna_map.searchers.google_map_searcher",
+}
+
+
+def get_searcher(searcher_name: str) -> AbstractSearcher:
+    """Return the shared searcher instance registered as ``searcher_name``.
+
+    Searchers cache their results per instance, so requests and warm-up must
+    share one instance per searcher to hit the same cache. Unknown names fall
+    back to ``DEFAULT_SEARCHER``. The backend module is imported on first use.
+    """
+    if searcher_name not in NAME2PATH:
+        searcher_name = DEFAULT_SEARCHER
+    return _instantiate(searcher_name)
+
+
+def load_searchers() -> None:
+    """Import every searcher backend up front.
+
+    Used by the gunicorn master with ``preload_app`` so that the backends are
+    imported once and shared copy-on-write by the forked workers.
+    """
+    for module_path in NAME2PATH.values():
+        import_module(module_path)
+
+
+@cache
+def _instantiate(searcher_name: str) -> AbstractSearcher:
+    module = import_module(NAME2PATH[searcher_name])
+    return getattr(module, searcher_name)()
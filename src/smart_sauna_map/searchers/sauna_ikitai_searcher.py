@@ -1,20 +1,46 @@
 from __future__ import annotations
 
+import codecs
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from functools import cache
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 from urllib.parse import urlencode, urlparse
 
 import requests
 from bs4 import BeautifulSoup
 
+from smart_sauna_map import upstream
 from smart_sauna_map.data_models.room import MansRoom, UnisexRoom, WomansRoom
 from smart_sauna_map.data_models.sauna import Sauna
 from smart_sauna_map.geocoding import geocode
 from smart_sauna_map.searchers.abstract_searcher import AbstractSearcher
 
+# Extract sauna cards while the search result page is still being received.
+SAUNA_IKITAI_STREAMING = os.environ.get("SAUNA_IKITAI_STREAMING", "") == "1"
+STREAM_CHUNK_SIZE = 16 * 1024
+STREAM_MAX_WORKERS = 8
+
+# NOTE: Any complete start tag with the class "p-saunaItem", like
+# ``find_all(class_="p-saunaItem")``.
+_CARD_START = re.compile(
+    r"<([a-z][\w:-]*)\s[^>]*?(?<![\w-])class\s*=\s*"
+    r"""(?:"[^"]*?|'[^']*?|)(?<![\w-])(?-i:p-saunaItem)(?![\w-])[^>]*>""",
+    re.IGNORECASE,
+)
+
+
+@cache
+def _tag(name: str) -> re.Pattern[str]:
+    """Match the start (group 1 is empty) or end tag of an element."""
+    return re.compile(rf"<(/?){re.escape(name)}\b", re.IGNORECASE)
+
 
 class SaunaIkitaiSearcher(AbstractSearcher):
+    def __init__(self, streaming: bool = SAUNA_IKITAI_STREAMING):
+        self.streaming = streaming
+
     @cache
     def search_sauna(
         self,
@@ -51,6 +77,9 @@ class SaunaIkitaiSearcher(AbstractSearcher):
                 )
             ]
         """
+        if self.streaming:
+            return _extract_saunas_from_stream(_stream_request(keyword))
+
         response: str = _request(keyword)
         soup: BeautifulSoup = _parse(response)
         return _extract_saunas(soup)
@@ -69,10 +98,61 @@ def _request(
     return res.text
 
 
+def _stream_request(
+    keyword: Optional[str] = "富士",
+) -> Iterator[str]:
+    """Same as ``_request`` but yield the body in decoded chunks as received."""
+    url = "https://sauna-ikitai.com/search"
+    payload: dict[str, str | int] = {}
+    if keyword:
+        payload.update({"keyword": keyword})
+
+    res: requests.models.Response = _sub_request(url, payload, stream=True)
+    try:
+        _raise_error_if_status_code_is_not_200(res)
+        decoder = codecs.getincrementaldecoder(res.encoding or "utf-8")("replace")
+        for chunk in res.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            yield decoder.decode(chunk)
+        yield decoder.decode(b"", final=True)
+    finally:
+        res.close()
+
+
 def _sub_request(
-    url: str, payload: dict[str, str | int], timeout: float = 3.0
+    url: str,
+    payload: dict[str, str | int],
+    timeout: float = 3.0,
+    stream: bool = False,
 ) -> requests.models.Response:
-    return requests.get(url, params=urlencode(payload), timeout=timeout)
+    return upstream.transport.call(
+        "sauna-ikitai",
+        {"url": url, "payload": payload},
+        lambda: requests.get(
+            url, params=urlencode(payload), timeout=timeout, stream=stream
+        ),
+        encode=_encode_response,
+        decode=_decode_response,
+    )
+
+
+def _encode_response(res: requests.models.Response) -> dict[str, str | int]:
+    return {
+        "url": res.url,
+        "status_code": res.status_code,
+        "reason": res.reason,
+        "text": res.text,
+    }
+
+
+def _decode_response(record: dict) -> requests.models.Response:
+    res = requests.models.Response()
+    res.url = record["url"]
+    res.status_code = record["status_code"]
+    res.reason = record["reason"]
+    res.encoding = "utf-8"
+    res._content = record["text"].encode("utf-8")
+    res._content_consumed = True
+    return res
 
 
 def _raise_error_if_status_code_is_not_200(res: requests.models.Response):
@@ -84,24 +164,82 @@ def _parse(res: str) -> BeautifulSoup:
 
 
 def _extract_saunas(soup: BeautifulSoup) -> list[Sauna]:
-    def sauna(s: BeautifulSoup) -> Sauna:
-        name = _extract_sauna_name(s)
-        latlng = geocode(name)
-        return Sauna(
-            sauna_id=_extract_sauna_id(s),
-            name=name,
-            address=_extract_sauna_address(s),
-            ikitai=_extract_sauna_ikitai(s),
-            lat=latlng.get("lat", None),
-            lng=latlng.get("lng", None),
-            image_url=_extract_sauna_image_url(s),
-            mans_room=_extract_sauna_mans_room(s),
-            womans_room=_extract_sauna_womans_room(s),
-            unisex_room=_extract_sauna_unisex_room(s),
-            description=_extract_sauna_description(s),
-        )
-
-    return [sauna(s) for s in soup.find_all(class_="p-saunaItem")]
+    return [_extract_sauna(s) for s in soup.find_all(class_="p-saunaItem")]
+
+
+def _extract_saunas_from_stream(chunks: Iterable[str]) -> list[Sauna]:
+    """Extract saunas from the search result page given in chunks.
+
+    Each sauna card is parsed on its own as soon as it has been received, and
+    extracted (and geocoded) in a thread pool while the rest of the page is
+    still being received. The DOM of the whole page is never built.
+    """
+
+    def extract(card: str) -> Sauna:
+        return _extract_sauna(_parse(card))
+
+    with ThreadPoolExecutor(max_workers=STREAM_MAX_WORKERS) as executor:
+        futures = [executor.submit(extract, card) for card in _iter_cards(chunks)]
+        return [future.result() for future in futures]
+
+
+def _iter_cards(chunks: Iterable[str]) -> Iterator[str]:
+    """Yield the HTML of each ``p-saunaItem`` card as soon as it is complete.
+
+    A card ends where the element it starts with is closed.
+    """
+    buffer = ""
+    start: Optional[int] = None  # Start of the current card in the buffer.
+    pos = 0  # Where to continue scanning the buffer.
+    depth = 0
+    tag = ""  # Name of the card element.
+    for chunk in chunks:
+        buffer += chunk
+        while True:
+            if start is None:
+                matched = _CARD_START.search(buffer, pos)
+                if not matched:
+                    # NOTE: Keep the last tag in case a card start spans two chunks.
+                    last_tag = buffer.rfind("<")
+                    buffer = buffer[last_tag:] if last_tag != -1 else ""
+                    pos = 0
+                    break
+                start, pos, depth = matched.start(), matched.start(), 0
+                tag = matched.group(1)
+
+            matched = _tag(tag).search(buffer, pos)
+            if not matched or matched.end() == len(buffer):
+                break  # NOTE: Wait for the next chunk.
+            depth += -1 if matched.group(1) else 1
+            pos = matched.end()
+            if depth > 0:
+                continue
+
+            end = buffer.find(">", pos)
+            if end == -1:
+                pos = matched.start()
+                depth += 1
+                break
+            yield buffer[start : end + 1]
+            buffer, start, pos = buffer[end + 1 :], None, 0
+
+
+def _extract_sauna(s: BeautifulSoup) -> Sauna:
+    name = _extract_sauna_name(s)
+    latlng = geocode(name)
+    return Sauna(
+        sauna_id=_extract_sauna_id(s),
+        name=name,
+        address=_extract_sauna_address(s),
+        ikitai=_extract_sauna_ikitai(s),
+        lat=latlng.get("lat", None),
+        lng=latlng.get("lng", None),
+        image_url=_extract_sauna_image_url(s),
+        mans_room=_extract_sauna_mans_room(s),
+        womans_room=_extract_sauna_womans_room(s),
+        unisex_room=_extract_sauna_unisex_room(s),
+        description=_extract_sauna_description(s),
+    )
 
 
 def _extract_sauna_name(soup: BeautifulSoup) -> str:
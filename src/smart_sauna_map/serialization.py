@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import re
+from dataclasses import asdict
+from typing import Any
+
+from smart_sauna_map.data_models.sauna import Sauna
+
+try:
+    import msgpack  # type: ignore
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+__all__ = [
+    "MIMETYPE_JSON",
+    "MIMETYPE_MSGPACK",
+    "compact",
+    "compact_delta",
+    "msgpack_available",
+    "pack",
+    "slim",
+]
+
+MIMETYPE_JSON = "application/json"
+MIMETYPE_MSGPACK = "application/x-msgpack"
+
+
+def compact(saunas: list[Sauna]) -> dict[str, Any]:
+    """Encode saunas into the compact wire format.
+
+    Null, empty and placeholder fields are dropped from every sauna and the
+    shared part of each ``image_url`` is moved to a prefix table.
+
+    Args:
+        saunas: Saunas to encode.
+
+    Returns:
+        Dictionary with the prefix table and the slimmed saunas.
+
+    Examples:
+        >>> compact(search_sauna(keyword="しきじ"))
+        {
+            "url_prefixes": ["https://img.sauna-ikitai.com/sauna/"],
+            "saunas": [
+                {
+                    "sauna_id": 2779,
+                    "name": "サウナしきじ",
+                    ...,
+                    "image_url": [0, "2779_20220429_182044_Eittr9xyyp_medium.jpg"],
+                },
+            ],
+        }
+    """
+    url_prefixes, records = share_url_prefixes([slim(asdict(s)) for s in saunas])
+    return {"url_prefixes": url_prefixes, "saunas": records}
+
+
+def compact_delta(delta: dict[str, Any]) -> dict[str, Any]:
+    """Encode a delta response (see ``SnapshotStore.delta``) compactly.
+
+    Added and changed saunas are slimmed and share one prefix table.
+    """
+    records = [slim(r) for r in delta["added"] + delta["changed"]]
+    url_prefixes, records = share_url_prefixes(records)
+    n_added = len(delta["added"])
+    return {
+        **delta,
+        "url_prefixes": url_prefixes,
+        "added": records[:n_added],
+        "changed": records[n_added:],
+    }
+
+
+def slim(record: dict[str, Any]) -> dict[str, Any]:
+    """Drop null, empty and placeholder fields from a sauna record.
+
+    Rooms whose temperatures are all unknown or zero (``GoogleMapSearcher``
+    fills them with ``0.0``) are dropped as a whole.
+    """
+    slimmed = {}
+    for key, value in record.items():
+        if isinstance(value, dict):
+            if not any(value.values()):
+                continue
+            value = {k: v for k, v in value.items() if v is not None}
+        if value is None or value == []:
+            continue
+        slimmed[key] = value
+    return slimmed
+
+
+_URL_PREFIX = re.compile(r".*?[?&]photoreference=|.*/")
+
+
+def share_url_prefixes(
+    records: list[dict[str, Any]], key: str = "image_url"
+) -> tuple[list[str], list[dict[str, Any]]]:
+    """Replace ``records[*][key]`` URLs with ``[prefix_index, suffix]`` pairs.
+
+    The prefix is everything up to and including the ``photoreference=`` of
+    Google Place Photo URLs, which differ only in the photo reference, and
+    the last ``/`` of other URLs.
+    """
+    url_prefixes: list[str] = []
+    prefix2index: dict[str, int] = {}
+    shared = []
+    for record in records:
+        url = record.get(key)
+        matched = _URL_PREFIX.match(url) if isinstance(url, str) else None
+        if matched:
+            prefix, suffix = matched.group(), matched.string[matched.end() :]
+            if prefix not in prefix2index:
+                prefix2index[prefix] = len(url_prefixes)
+                url_prefixes.append(prefix)
+            record = {**record, key: [prefix2index[prefix], suffix]}
+        shared.append(record)
+    return url_prefixes, shared
+
+
+def pack(payload: Any) -> bytes:
+    """Serialize payload with MessagePack.
+
+    Raises:
+        RuntimeError: If ``msgpack`` is not installed.
+    """
+    if msgpack is None:
+        raise RuntimeError("msgpack is not installed.")
+    return msgpack.packb(payload, use_bin_type=True)
+
+
+def msgpack_available() -> bool:
+    return msgpack is not None
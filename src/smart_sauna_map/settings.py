@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import os
+from functools import cache
+from os.path import dirname, join
+from typing import Optional
+
+__all__ = ["google_map_api_key", "load_env"]
+
+
+@cache
+def load_env() -> None:
+    """Load ``.env`` next to this package into the environment once.
+
+    Called on first use instead of at import time so that booting a worker
+    does not pay for it.
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv(dotenv_path=join(dirname(__file__), ".env"))
+
+
+def google_map_api_key() -> Optional[str]:
+    load_env()
+    return os.environ.get("GOOGLE_MAP_API_KEY")
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+__all__ = ["SnapshotStore", "diff", "version_of"]
+
+SNAPSHOT_CACHE_SIZE = int(os.environ.get("SNAPSHOT_CACHE_SIZE", 256))
+
+Record = dict[str, Any]
+
+
+def version_of(records: list[Record]) -> str:
+    """Return the version token of a result set, i.e. a hash of its content."""
+    content = json.dumps(
+        records, sort_keys=True, ensure_ascii=False, separators=(",", ":")
+    )
+    return hashlib.sha1(content.encode()).hexdigest()[:16]
+
+
+def diff(base: dict[Any, Record], records: list[Record]) -> dict[str, list]:
+    """Compare a result set with a base snapshot keyed by ``sauna_id``.
+
+    Returns:
+        Saunas added to and changed from the base, and ``sauna_id`` of the
+        saunas removed from it.
+    """
+    added, changed = [], []
+    sauna_ids = set()
+    for record in records:
+        sauna_id = record["sauna_id"]
+        sauna_ids.add(sauna_id)
+        if sauna_id not in base:
+            added.append(record)
+        elif base[sauna_id] != record:
+            changed.append(record)
+    removed = [sauna_id for sauna_id in base if sauna_id not in sauna_ids]
+    return {"added": added, "changed": changed, "removed": removed}
+
+
+class SnapshotStore:
+    """Keep the most recent result sets by version for delta responses.
+
+    Examples:
+        >>> store = SnapshotStore()
+        >>> base = store.put(records_before_pan)
+        >>> store.delta(base, records_after_pan)
+        {
+            "version": "5d41402abc4b2a76",
+            "base": "7d793037a0760186",
+            "added": [{"sauna_id": 1647, ...}],
+            "changed": [],
+            "removed": [2779],
+        }
+    """
+
+    def __init__(self, maxsize: int = SNAPSHOT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._snapshots: OrderedDict[str, dict[Any, Record]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, records: list[Record]) -> str:
+        """Store a result set and return its version."""
+        version = version_of(records)
+        with self._lock:
+            if version not in self._snapshots:
+                self._snapshots[version] = {r["sauna_id"]: r for r in records}
+            self._snapshots.move_to_end(version)
+            while len(self._snapshots) > self.maxsize:
+                self._snapshots.popitem(last=False)
+        return version
+
+    def get(self, version: str) -> Optional[dict[Any, Record]]:
+        with self._lock:
+            return self._snapshots.get(version)
+
+    def delta(self, base_version: str, records: list[Record]) -> dict[str, Any]:
+        """Store a result set and describe it relative to ``base_version``.
+
+        If the base version is unknown (e.g. evicted, or held by another
+        worker), ``base`` is ``None`` and every sauna is listed as added.
+        """
+        base = self.get(base_version)
+        version = self.put(records)
+        if base is None:
+            return {"version": version, "base": None, **diff({}, records)}
+        return {"version": version, "base": base_version, **diff(base, records)}
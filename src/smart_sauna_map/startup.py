@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import subprocess
+import sys
+from dataclasses import dataclass
+
+__all__ = ["ImportTime", "measure_import_time"]
+
+HEAVY_MODULES = ("bs4", "geopy", "googlemaps", "numpy", "requests")
+
+
+@dataclass
+class ImportTime:
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def measure_import_time(module_name: str = "smart_sauna_map.api") -> list[ImportTime]:
+    """Measure the import time of a module in a fresh interpreter.
+
+    Args:
+        module_name: Module to import.
+
+    Returns:
+        Import time of every module imported on the way, in import order.
+        The last item is ``module_name`` itself.
+
+    Examples:
+        >>> measure_import_time()[-1]
+        ImportTime(module='smart_sauna_map.api', self_us=1893, cumulative_us=151934)
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    import_times = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue  # header
+        import_times.append(
+            ImportTime(
+                module=module.strip(),
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+            )
+        )
+    return import_times
+
+
+def main(module_name: str = "smart_sauna_map.api", top: int = 10) -> None:
+    import_times = measure_import_time(module_name)
+    modules = {t.module for t in import_times}
+    print(f"{module_name}: {import_times[-1].cumulative_us / 1000:.1f} ms")
+    print(f"heavy modules imported: {[m for m in HEAVY_MODULES if m in modules]}")
+    for t in sorted(import_times, key=lambda t: t.self_us, reverse=True)[:top]:
+        print(f"{t.self_us / 1000:8.1f} ms  {t.module}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "smart_sauna_map.api")
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import math
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Optional
+
+from smart_sauna_map.catalog import AbstractIndex
+from smart_sauna_map.data_models.sauna import Sauna
+
+__all__ = ["TileIndex", "tile_of"]
+
+# NOTE: Tiles follow the XYZ (slippy map) scheme of Web Mercator.
+MAX_ZOOM = 22
+# Tiles at this zoom level and above list individual saunas instead of clusters.
+INDIVIDUAL_ZOOM = int(os.environ.get("TILE_INDIVIDUAL_ZOOM", 15))
+# Each tile is split into a grid of 2 ** GRID_BITS x 2 ** GRID_BITS clusters.
+GRID_BITS = 3
+# Number of rendered tiles to keep.
+TILE_CACHE_SIZE = int(os.environ.get("TILE_CACHE_SIZE", 4096))
+
+MAX_LATITUDE = 85.05112878
+
+TileKey = tuple[int, int, int]
+CellKey = tuple[int, int]
+
+
+def tile_of(lat: float, lng: float, zoom: int) -> tuple[int, int]:
+    """Return the x and y of the tile containing a coordinate at given zoom."""
+    x, y = _project(lat, lng, zoom)
+    n = 1 << zoom
+    return min(int(x), n - 1), min(int(y), n - 1)
+
+
+def _project(lat: float, lng: float, zoom: int) -> tuple[float, float]:
+    n = 1 << zoom
+    lat_rad = math.radians(max(-MAX_LATITUDE, min(MAX_LATITUDE, lat)))
+    x = (lng + 180.0) / 360.0 * n
+    y = (1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n
+    return x, y
+
+
+def _coordinates(sauna: Sauna) -> tuple[float, float]:
+    # NOTE: SaunaCatalog only notifies indexes of saunas with coordinates.
+    assert sauna.lat is not None and sauna.lng is not None
+    return sauna.lat, sauna.lng
+
+
+@dataclass
+class Cluster:
+    sauna_ids: set[Any] = field(default_factory=set)
+    sum_lat: float = 0.0
+    sum_lng: float = 0.0
+    max_ikitai: Optional[float] = None
+
+    def to_dict(self) -> dict[str, Any]:
+        count = len(self.sauna_ids)
+        return {
+            "count": count,
+            "lat": self.sum_lat / count,
+            "lng": self.sum_lng / count,
+            "max_ikitai": self.max_ikitai,
+        }
+
+
+class TileIndex(AbstractIndex):
+    """Clusters of saunas per map tile, maintained as the catalog changes.
+
+    For every zoom level up to ``INDIVIDUAL_ZOOM`` each sauna belongs to one
+    grid cell of one tile; the count, coordinate sums and maximum ikitai of
+    the cell are updated when a sauna is added, moved or changed. The most
+    recently used non-empty tiles are cached, and only the tiles containing
+    the old or new position of a changed sauna are invalidated.
+
+    Examples:
+        >>> tiles = TileIndex()
+        >>> catalog.add_index(tiles)
+        >>> tiles.tile(5, 28, 12)
+        {
+            "z": 5, "x": 28, "y": 12,
+            "clusters": [
+                {"count": 42, "lat": 35.68, "lng": 139.72, "max_ikitai": 8949},
+                ...,
+            ],
+            "saunas": [],
+        }
+    """
+
+    def __init__(self, cache_size: int = TILE_CACHE_SIZE):
+        self.cache_size = cache_size
+        self._saunas: dict[Any, Sauna] = {}
+        self._clusters: dict[TileKey, dict[CellKey, Cluster]] = {}
+        self._tiles: OrderedDict[TileKey, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def update(self, old: Optional[Sauna], new: Sauna) -> None:
+        with self._lock:
+            if old is not None:
+                self._remove(old)
+            self._saunas[new.sauna_id] = new
+            self._add(new)
+
+    def tile(self, z: int, x: int, y: int) -> dict[str, Any]:
+        """Return the clusters (or saunas at high zoom) in a tile.
+
+        Raises:
+            ValueError: If the tile does not exist.
+        """
+        if not 0 <= z <= MAX_ZOOM or not (0 <= x < 1 << z and 0 <= y < 1 << z):
+            raise ValueError(f"tile {z}/{x}/{y} does not exist.")
+
+        with self._lock:
+            key = (z, x, y)
+            if key in self._tiles:
+                self._tiles.move_to_end(key)
+                return self._tiles[key]
+
+            tile = self._render(z, x, y)
+            # NOTE: Empty tiles are cheap to render; caching them would let
+            # clients fill the cache with arbitrary tiles.
+            if tile["clusters"] or tile["saunas"]:
+                self._tiles[key] = tile
+                while len(self._tiles) > self.cache_size:
+                    self._tiles.popitem(last=False)
+            return tile
+
+    def _render(self, z: int, x: int, y: int) -> dict[str, Any]:
+        tile: dict[str, Any] = {"z": z, "x": x, "y": y, "clusters": [], "saunas": []}
+        if z < INDIVIDUAL_ZOOM:
+            tile["clusters"] = [
+                c.to_dict() for c in self._clusters.get((z, x, y), {}).values()
+            ]
+            return tile
+
+        shift = z - INDIVIDUAL_ZOOM
+        ancestor = (INDIVIDUAL_ZOOM, x >> shift, y >> shift)
+        for cluster in self._clusters.get(ancestor, {}).values():
+            for sauna_id in cluster.sauna_ids:
+                sauna = self._saunas[sauna_id]
+                if tile_of(*_coordinates(sauna), z) == (x, y):
+                    tile["saunas"].append(asdict(sauna))
+        return tile
+
+    def _add(self, sauna: Sauna) -> None:
+        lat, lng = _coordinates(sauna)
+        for z in range(INDIVIDUAL_ZOOM + 1):
+            tile_key, cell_key = self._locate(lat, lng, z)
+            cluster = self._clusters.setdefault(tile_key, {}).setdefault(
+                cell_key, Cluster()
+            )
+            cluster.sauna_ids.add(sauna.sauna_id)
+            cluster.sum_lat += lat
+            cluster.sum_lng += lng
+            if cluster.max_ikitai is None or sauna.ikitai > cluster.max_ikitai:
+                cluster.max_ikitai = sauna.ikitai
+        self._invalidate(lat, lng)
+
+    def _remove(self, sauna: Sauna) -> None:
+        lat, lng = _coordinates(sauna)
+        for z in range(INDIVIDUAL_ZOOM + 1):
+            tile_key, cell_key = self._locate(lat, lng, z)
+            cells = self._clusters[tile_key]
+            cluster = cells[cell_key]
+            cluster.sauna_ids.discard(sauna.sauna_id)
+            if not cluster.sauna_ids:
+                del cells[cell_key]
+                if not cells:
+                    del self._clusters[tile_key]
+                continue
+            cluster.sum_lat -= lat
+            cluster.sum_lng -= lng
+            if sauna.ikitai == cluster.max_ikitai:
+                cluster.max_ikitai = max(
+                    self._saunas[i].ikitai for i in cluster.sauna_ids
+                )
+        del self._saunas[sauna.sauna_id]
+        self._invalidate(lat, lng)
+
+    def _locate(self, lat: float, lng: float, z: int) -> tuple[TileKey, CellKey]:
+        cx, cy = tile_of(lat, lng, z + GRID_BITS)
+        return (z, cx >> GRID_BITS, cy >> GRID_BITS), (cx, cy)
+
+    def _invalidate(self, lat: float, lng: float) -> None:
+        for z in range(MAX_ZOOM + 1):
+            self._tiles.pop((z, *tile_of(lat, lng, z)), None)
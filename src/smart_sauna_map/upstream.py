@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from typing import Any, BinaryIO, Callable, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+__all__ = ["ReplayMissError", "Transport", "UpstreamArchive", "transport"]
+
+LIVE = "live"
+RECORD = "record"
+REPLAY = "replay"
+FALLBACK = "fallback"  # Serve from the archive, fall back to live (and record).
+MODES = (LIVE, RECORD, REPLAY, FALLBACK)
+
+UPSTREAM_MODE = os.environ.get("UPSTREAM_MODE", LIVE)
+UPSTREAM_ARCHIVE = os.environ.get("UPSTREAM_ARCHIVE", "upstream_archive.jsonl.gz")
+# Seconds to wait before serving from the archive, or "recorded" to wait as
+# long as the live call took when it was recorded.
+UPSTREAM_LATENCY = os.environ.get("UPSTREAM_LATENCY", "0")
+
+ARCHIVE_CHUNK_SIZE = 64 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayMissError(LookupError):
+    pass
+
+
+class UpstreamArchive:
+    """Upstream responses persisted as gzip-compressed JSON Lines.
+
+    Each line is ``{"key": ..., "response": ..., "elapsed": ...}``; a later
+    line for the same key overrides an earlier one. The file is read on first
+    use and appended to as new responses are recorded.
+
+    Each line is appended as one gzip member under an exclusive ``flock`` of
+    the file, so that workers recording at the same time do not interleave.
+    A truncated or corrupt tail (e.g. from a worker killed while writing) is
+    skipped when the file is read, and cut off before the next line is
+    appended so that the lines after it stay readable.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: Optional[dict[str, dict[str, Any]]] = None
+        # End of the last complete member read from the file.
+        self._offset = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            return self._load().get(key)
+
+    def put(self, key: str, response: Any, elapsed: float) -> None:
+        entry = {"key": key, "response": response, "elapsed": elapsed}
+        member = gzip.compress(
+            (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+        )
+        with self._lock:
+            entries = self._load()
+            with open(self.path, "a+b") as f:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    # NOTE: Catch up with the lines appended by other workers.
+                    self._read(f, entries)
+                    if f.seek(0, os.SEEK_END) > self._offset:
+                        logger.warning("Cut off the corrupt tail of %s.", self.path)
+                        f.truncate(self._offset)
+                    f.write(member)
+                    f.flush()
+                    self._offset = f.tell()
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(f, fcntl.LOCK_UN)
+            entries[key] = entry
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        if self._entries is None:
+            self._entries = {}
+            if os.path.exists(self.path):
+                with open(self.path, "rb") as f:
+                    self._read(f, self._entries)
+                    if f.seek(0, os.SEEK_END) > self._offset:
+                        logger.warning("Skipped the corrupt tail of %s.", self.path)
+        return self._entries
+
+    def _read(self, f: BinaryIO, entries: dict[str, dict[str, Any]]) -> None:
+        """Read the complete members after ``self._offset`` into ``entries``."""
+        f.seek(self._offset)
+        for content, end in _iter_members(f):
+            try:
+                lines = [
+                    json.loads(line) for line in content.decode("utf-8").splitlines()
+                ]
+                read = {entry["key"]: entry for entry in lines}
+            except (KeyError, TypeError, ValueError):
+                return
+            entries.update(read)
+            self._offset = end
+
+
+def _iter_members(f: BinaryIO) -> Iterator[tuple[bytes, int]]:
+    """Yield the content of each gzip member from the current position of
+    ``f`` with the position after it, until a truncated or corrupt member."""
+    start = f.tell()  # Start of the current member.
+    fed = 0  # Bytes of the current member fed to the decompressor.
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    content: list[bytes] = []
+    data = b""
+    while True:
+        if not data:
+            data = f.read(ARCHIVE_CHUNK_SIZE)
+            if not data:
+                return
+        try:
+            content.append(decompressor.decompress(data))
+        except zlib.error:
+            return
+        if not decompressor.eof:
+            fed, data = fed + len(data), b""
+            continue
+
+        end = start + fed + len(data) - len(decompressor.unused_data)
+        yield b"".join(content), end
+        data = decompressor.unused_data
+        start, fed, content = end, 0, []
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+
+class Transport:
+    """Route upstream calls to the live service and/or an on-disk archive.
+
+    Modes:
+        live: Always call the live service.
+        record: Call the live service and record the responses.
+        replay: Serve recorded responses only. A miss raises ReplayMissError.
+        fallback: Serve recorded responses, calling (and recording) the live
+            service for the misses.
+
+    Examples:
+        >>> transport = Transport(mode="record", archive_path="upstream.jsonl.gz")
+        >>> transport.call("geocode", {"query": "新宿"}, lambda: geocode("新宿"))
+        {'lat': 35.6938253, 'lng': 139.7033559}
+    """
+
+    def __init__(
+        self,
+        mode: str = LIVE,
+        archive_path: str = UPSTREAM_ARCHIVE,
+        latency: Optional[float] = 0.0,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, but got {mode}.")
+        self.mode = mode
+        self.archive = UpstreamArchive(archive_path)
+        self.latency = latency
+
+    @classmethod
+    def from_env(cls) -> Transport:
+        latency = None if UPSTREAM_LATENCY == "recorded" else float(UPSTREAM_LATENCY)
+        return cls(mode=UPSTREAM_MODE, archive_path=UPSTREAM_ARCHIVE, latency=latency)
+
+    @staticmethod
+    def key(service: str, request: dict[str, Any]) -> str:
+        return f"{service}:{json.dumps(request, sort_keys=True, ensure_ascii=False)}"
+
+    def call(
+        self,
+        service: str,
+        request: dict[str, Any],
+        live: Callable[[], Any],
+        *,
+        encode: Callable[[Any], Any] = lambda response: response,
+        decode: Callable[[Any], Any] = lambda response: response,
+    ) -> Any:
+        """Get the response of an upstream call.
+
+        Args:
+            service: Name of the upstream service.
+            request: JSON-serializable parameters identifying the call.
+            live: Function calling the live service.
+            encode: Convert a live response to a JSON-serializable value.
+            decode: Convert an archived value back to a response.
+
+        Returns:
+            The live or archived response.
+        """
+        if self.mode == LIVE:
+            return live()
+
+        key = self.key(service, request)
+        if self.mode in (REPLAY, FALLBACK):
+            entry = self.archive.get(key)
+            if entry is not None:
+                time.sleep(entry["elapsed"] if self.latency is None else self.latency)
+                return decode(entry["response"])
+            if self.mode == REPLAY:
+                raise ReplayMissError(f"{key} is not in {self.archive.path}.")
+
+        started_at = time.perf_counter()
+        response = live()
+        self.archive.put(key, encode(response), time.perf_counter() - started_at)
+        return response
+
+
+transport = Transport.from_env()
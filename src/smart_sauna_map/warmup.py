@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Optional
+
+from smart_sauna_map.search_sauna import search_sauna
+from smart_sauna_map.searchers.registry import DEFAULT_SEARCHER, get_searcher
+
+__all__ = ["HotQuery", "WarmUp", "load_hot_queries"]
+
+WARMUP_KEYWORDS_FILE = os.environ.get("WARMUP_KEYWORDS_FILE")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class HotQuery:
+    keyword: str
+    searcher: str = DEFAULT_SEARCHER
+
+
+@dataclass
+class WarmUpStatus:
+    total: int
+    completed: int = 0
+    failed: int = 0
+    finished: bool = False
+    elapsed_seconds: float | None = None
+    error: str | None = None
+
+
+def load_hot_queries(path: str) -> list[HotQuery]:
+    """Read hot queries to warm up from a file.
+
+    Each non-empty line is either a JSON object such as
+    ``{"keyword": "新宿", "searcher": "SaunaIkitaiSearcher"}`` or a bare keyword.
+    Lines starting with ``#`` are ignored.
+
+    Args:
+        path: Path to the hot keyword file.
+
+    Returns:
+        Hot queries in file order without duplicates.
+    """
+    queries: dict[HotQuery, None] = {}
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                record = json.loads(line)
+                query = HotQuery(
+                    keyword=record["keyword"],
+                    searcher=record.get("searcher", DEFAULT_SEARCHER),
+                )
+            else:
+                query = HotQuery(keyword=line)
+            queries[query] = None
+    return list(queries)
+
+
+def _search(query: HotQuery) -> None:
+    search_sauna(keyword=query.keyword, searcher=get_searcher(query.searcher))
+
+
+class WarmUp:
+    """Populate the search and geocode caches in a background thread.
+
+    Examples:
+        >>> warm_up = WarmUp([HotQuery("新宿"), HotQuery("しきじ")]).start()
+        >>> warm_up.wait(timeout=60.0)
+        True
+        >>> warm_up.status()
+        {'total': 2, 'completed': 2, 'failed': 0, 'finished': True, ...}
+    """
+
+    def __init__(
+        self,
+        queries: list[HotQuery],
+        *,
+        search: Callable[[HotQuery], None] = _search,
+    ):
+        self.queries = queries
+        self._search = search
+        self._status = WarmUpStatus(total=len(queries))
+        self._finished = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_file(cls, path: Optional[str] = WARMUP_KEYWORDS_FILE) -> WarmUp:
+        """Build a warm-up from a hot keyword file, or an empty one if not set.
+
+        Warm-up is best-effort: if the file cannot be read, the warm-up is
+        empty and the error is reported in ``status()``.
+        """
+        if not path:
+            return cls([])
+        try:
+            queries = load_hot_queries(path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Failed to load hot queries from %s.", path, exc_info=True)
+            warm_up = cls([])
+            warm_up._status.error = f"{type(e).__name__}: {e}"
+            return warm_up
+        return cls(queries)
+
+    def start(self) -> WarmUp:
+        """Start warming up without blocking the caller.
+
+        Call it in the process that serves requests, i.e. in each gunicorn
+        worker after fork (see ``gunicorn.conf.py``), never at import time.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="smart-sauna-map-warmup", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until warm-up has finished. Returns False on timeout."""
+        return self._finished.wait(timeout)
+
+    def status(self) -> dict:
+        return asdict(self._status)
+
+    def _run(self) -> None:
+        started_at = time.perf_counter()
+        for query in self.queries:
+            try:
+                self._search(query)
+                self._status.completed += 1
+            except Exception:
+                self._status.failed += 1
+                logger.warning("Failed to warm up %s.", query, exc_info=True)
+
+        self._status.elapsed_seconds = time.perf_counter() - started_at
+        self._status.finished = True
+        self._finished.set()
+        logger.info(
+            "Warm-up finished: %d/%d queries in %.1f seconds.",
+            self._status.completed,
+            self._status.total,
+            self._status.elapsed_seconds,
+        )
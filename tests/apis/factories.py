@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+from typing import Optional
+
+from smart_sauna_map.data_models.sauna import Sauna
+
+
+def sauna(
+    sauna_id: int,
+    lat: float = 35.69,
+    lng: float = 139.70,
+    ikitai: int = 100,
+    description: Optional[list[str]] = None,
+) -> Sauna:
+    return Sauna(
+        sauna_id=sauna_id,
+        name=f"サウナ{sauna_id}",
+        address="東京都新宿区",
+        ikitai=ikitai,
+        lat=lat,
+        lng=lng,
+        image_url=f"https://img.sauna-ikitai.com/sauna/{sauna_id}_medium.jpg",
+        mans_room=None,
+        womans_room=None,
+        unisex_room=None,
+        description=description,
+    )
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+import gzip
+
+import pytest
+
+from smart_sauna_map.api import app
+from smart_sauna_map.data_models.sauna import Sauna
+
+SAUNAS = [
+    Sauna(
+        sauna_id=i,
+        name=f"サウナ{i}",
+        address="静岡県静岡市駿河区敷地2-25-1",
+        ikitai=i,
+        lat=34.950765,
+        lng=138.413977,
+        image_url=f"https://img.sauna-ikitai.com/sauna/{i}_medium.jpg",
+        mans_room=None,
+        womans_room=None,
+        unisex_room=None,
+        description=["入浴料：500円〜", "定休日：無休"],
+    )
+    for i in range(20)
+]
+
+
+@pytest.fixture(autouse=True)
+def mock_search_sauna(mocker):
+    mocker.patch("smart_sauna_map.api._search_sauna", return_value=SAUNAS)
+
+
+def post(accept_encoding: str):
+    return app.test_client().post(
+        "/search_sauna",
+        json={"keyword": "静岡"},
+        headers={"Accept-Encoding": accept_encoding},
+    )
+
+
+def test_gzip():
+    response = post("gzip")
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert len(gzip.decompress(response.data)) > len(response.data)
+
+
+def test_brotli():
+    brotli = pytest.importorskip("brotli")
+    response = post("gzip, br")
+
+    assert response.headers["Content-Encoding"] == "br"
+    assert brotli.decompress(response.data).startswith(b"[")
+
+
+def test_identity():
+    response = post("identity")
+
+    assert "Content-Encoding" not in response.headers
+    assert len(response.get_json()) == len(SAUNAS)
+
+
+def test_small_body_is_not_compressed(mocker):
+    mocker.patch("smart_sauna_map.api._search_sauna", return_value=[])
+    response = post("gzip")
+
+    assert "Content-Encoding" not in response.headers
+    assert response.get_json() == []
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+from datetime import datetime, timezone
+
+import pytest
+from factories import sauna
+
+from smart_sauna_map.api import app
+from smart_sauna_map.catalog import SaunaCatalog
+from smart_sauna_map.nearby import NearbyIndex, haversine_km
+from smart_sauna_map.opening_hours import TIMEZONE, is_open, parse_service_hours
+
+SHINJUKU_STATION = {"lat": 35.6909, "lng": 139.7003}
+SEEN_AT = datetime(2022, 11, 7, 7, 0, tzinfo=TIMEZONE)
+
+
+TERMA = sauna(1821, 35.6949, 139.7030, 3366, ["本日の営業時間: 24時間営業"])
+SOLA_SPA = sauna(2, 35.6956, 139.7019, 1000, ["本日の営業時間: 11時00分～23時00分"])
+SHIKIJI = sauna(2779, 34.950765, 138.413977, 8949, ["入浴料：500円〜", "定休日：無休"])
+HAKODATE = sauna(3, 41.7687, 140.7288, 500, ["本日の営業時間: 定休日"])
+
+
+@pytest.fixture
+def nearby_index() -> NearbyIndex:
+    catalog = SaunaCatalog()
+    nearby_index = NearbyIndex()
+    catalog.add_index(nearby_index)
+    catalog.upsert([TERMA, SOLA_SPA, SHIKIJI, HAKODATE], at=SEEN_AT)
+    return nearby_index
+
+
+def test_haversine_km():
+    (distance,) = haversine_km(35.6909, 139.7003, [34.950765], [138.413977])
+
+    assert distance == pytest.approx(142.8, abs=0.1)
+
+
+def test_haversine_km_many():
+    distances = haversine_km(
+        35.6909,
+        139.7003,
+        [35.6909, 34.950765, 41.7687],
+        [139.7003, 138.413977, 140.7288],
+    )
+
+    assert distances == pytest.approx([0.0, 142.8, 681.7], abs=0.1)
+    assert haversine_km(35.6909, 139.7003, [], []) == []
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("5時30分～22時00分", ((330, 1320),)),
+        ("10時00分～翌2時00分", ((600, 120),)),
+        ("24時間営業", ((0, 1440),)),
+        ("定休日", ()),
+        ("記載なし", None),
+    ],
+)
+def test_parse_service_hours(text, expected):
+    assert parse_service_hours(text) == expected
+
+
+def test_nearest(nearby_index):
+    saunas = nearby_index.nearest(**SHINJUKU_STATION, k=3)
+
+    assert [s.sauna_id for _, s in saunas] == [1821, 2, 2779]
+    assert [d for d, _ in saunas] == sorted(d for d, _ in saunas)
+
+
+def test_nearest_with_min_ikitai(nearby_index):
+    saunas = nearby_index.nearest(**SHINJUKU_STATION, k=2, min_ikitai=3000)
+
+    assert [s.sauna_id for _, s in saunas] == [1821, 2779]
+
+
+def test_nearest_open_now(nearby_index):
+    now = datetime(2022, 11, 7, 8, 0, tzinfo=TIMEZONE)
+    saunas = nearby_index.nearest(**SHINJUKU_STATION, k=10, open_now=True, now=now)
+
+    assert [s.sauna_id for _, s in saunas] == [1821]
+
+
+def test_nearest_open_now_ignores_hours_seen_on_another_day():
+    catalog = SaunaCatalog()
+    nearby_index = NearbyIndex()
+    catalog.add_index(nearby_index)
+    catalog.upsert([TERMA, SOLA_SPA], at=SEEN_AT)
+    now = datetime(2022, 11, 8, 12, 0, tzinfo=TIMEZONE)
+
+    assert nearby_index.nearest(**SHINJUKU_STATION, open_now=True, now=now) == []
+
+    catalog.upsert([TERMA], at=now)
+    saunas = nearby_index.nearest(**SHINJUKU_STATION, open_now=True, now=now)
+
+    assert [s.sauna_id for _, s in saunas] == [1821]
+
+
+@pytest.mark.parametrize(
+    "now, expected",
+    [
+        (datetime(2022, 11, 7, 12, 0, tzinfo=TIMEZONE), True),
+        # NOTE: 2022-11-07 12:00 in Japan.
+        (datetime(2022, 11, 7, 3, 0, tzinfo=timezone.utc), True),
+        # NOTE: 2022-11-07 8:00 in Japan.
+        (datetime(2022, 11, 6, 23, 0, tzinfo=timezone.utc), False),
+    ],
+)
+def test_is_open(now, expected):
+    assert is_open(SOLA_SPA, now) is expected
+
+
+class TestNearbyEndpoint:
+    def test(self, mocker, nearby_index):
+        mocker.patch("smart_sauna_map.api.nearby_index", nearby_index)
+        response = app.test_client().post("/nearby", json={**SHINJUKU_STATION, "k": 1})
+
+        (nearest,) = response.get_json()
+        assert nearest["sauna_id"] == 1821
+        assert nearest["distance_km"] == pytest.approx(0.5, abs=0.1)
+
+    @pytest.mark.parametrize(
+        "body",
+        [
+            {"lat": 35.6909},
+            {"lat": "nan", "lng": 139.7003},
+            {"lat": 35.6909, "lng": "inf"},
+            {"lat": 91.0, "lng": 139.7003},
+            {"lat": 35.6909, "lng": -180.5},
+            {**SHINJUKU_STATION, "open_now": "false"},
+            {**SHINJUKU_STATION, "open_now": 1},
+        ],
+    )
+    def test_400(self, body):
+        response = app.test_client().post("/nearby", json=body)
+
+        assert response.status_code == 400
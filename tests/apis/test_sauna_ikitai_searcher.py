@@ -7,6 +7,11 @@ from requests.exceptions import HTTPError
 from smart_sauna_map.data_models.room import MansRoom, UnisexRoom, WomansRoom
 from smart_sauna_map.data_models.sauna import Sauna
 from smart_sauna_map.search_sauna import search_sauna
+from smart_sauna_map.searchers.sauna_ikitai_searcher import (
+    SaunaIkitaiSearcher,
+    _extract_saunas,
+    _parse,
+)
 
 
 def read_html(filename):
@@ -115,3 +120,71 @@ class TestSearchSauna:
         )
         with pytest.raises(HTTPError):
             search_sauna(keyword="")
+
+
+def mock_streamed_response(text: str, status_code: int = 200):
+    r = mock_response(status_code)
+    r.encoding = "utf-8"
+    r._content = text.encode("utf-8")
+    r._content_consumed = True
+    return r
+
+
+class TestStreamingSearchSauna:
+    @pytest.fixture(autouse=True)
+    def mock_geocode(self, mocker):
+        mocker.patch(
+            "smart_sauna_map.searchers.sauna_ikitai_searcher.geocode",
+            return_value=LAT_LNG_SHINJUKU,
+        )
+
+    @pytest.mark.parametrize("chunk_size", [1, 100, 16 * 1024])
+    def test_same_as_whole_page(self, mocker, chunk_size):
+        mocker.patch(
+            "smart_sauna_map.searchers.sauna_ikitai_searcher.STREAM_CHUNK_SIZE",
+            chunk_size,
+        )
+        mocker.patch(
+            "smart_sauna_map.searchers.sauna_ikitai_searcher._sub_request",
+            return_value=mock_streamed_response(HTML_SHINJUKU),
+        )
+        expected = _extract_saunas(_parse(HTML_SHINJUKU))
+
+        actual = SaunaIkitaiSearcher(streaming=True).search_sauna(keyword="新宿")
+
+        assert len(actual) == 20
+        assert actual == expected
+
+    @pytest.mark.parametrize(
+        "card_start",
+        [
+            """<div id="card" class='p-saunaItem p-saunaItem--list'>""",
+            '<DIV data-index="1" class="p-saunaItem--list p-saunaItem">',
+            "<div class=p-saunaItem>",
+        ],
+    )
+    def test_card_start_variants(self, mocker, card_start):
+        html = HTML_SHINJUKU.replace(
+            '<div class="p-saunaItem p-saunaItem--list ">', card_start
+        )
+        mocker.patch(
+            "smart_sauna_map.searchers.sauna_ikitai_searcher.STREAM_CHUNK_SIZE", 100
+        )
+        mocker.patch(
+            "smart_sauna_map.searchers.sauna_ikitai_searcher._sub_request",
+            return_value=mock_streamed_response(html),
+        )
+        expected = _extract_saunas(_parse(html))
+
+        actual = SaunaIkitaiSearcher(streaming=True).search_sauna(keyword="新宿")
+
+        assert len(actual) == 20
+        assert actual == expected
+
+    def test_get_404(self, mocker):
+        mocker.patch(
+            "smart_sauna_map.searchers.sauna_ikitai_searcher._sub_request",
+            return_value=mock_streamed_response("", status_code=404),
+        )
+        with pytest.raises(HTTPError):
+            SaunaIkitaiSearcher(streaming=True).search_sauna(keyword="")
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+from dataclasses import asdict
+
+import pytest
+
+from smart_sauna_map.api import app
+from smart_sauna_map.data_models.room import MansRoom, WomansRoom
+from smart_sauna_map.data_models.sauna import Sauna
+from smart_sauna_map.serialization import compact, share_url_prefixes, slim
+
+SAUNA_SHIKIJI = Sauna(
+    sauna_id=2779,
+    name="サウナしきじ",
+    address="静岡県静岡市駿河区敷地2-25-1",
+    ikitai=8949,
+    lat=34.950765,
+    lng=138.413977,
+    image_url="https://img.sauna-ikitai.com/sauna/2779_medium.jpg",
+    mans_room=MansRoom(sauna_temperature=110.0, mizuburo_temperature=None),
+    womans_room=WomansRoom(sauna_temperature=0.0, mizuburo_temperature=0.0),
+    unisex_room=None,
+    description=[],
+)
+
+SAUNA_TERMA = Sauna(
+    sauna_id=1821,
+    name="新宿天然温泉 テルマー湯",
+    address="東京都新宿区歌舞伎町１丁目１−２",
+    ikitai=3366,
+    lat=None,
+    lng=None,
+    image_url="https://img.sauna-ikitai.com/sauna/1821_medium.jpg",
+    mans_room=None,
+    womans_room=None,
+    unisex_room=None,
+    description=["入浴料：2185円〜"],
+)
+
+
+def test_slim():
+    assert slim(asdict(SAUNA_SHIKIJI)) == {
+        "sauna_id": 2779,
+        "name": "サウナしきじ",
+        "address": "静岡県静岡市駿河区敷地2-25-1",
+        "ikitai": 8949,
+        "lat": 34.950765,
+        "lng": 138.413977,
+        "image_url": "https://img.sauna-ikitai.com/sauna/2779_medium.jpg",
+        "mans_room": {"sauna_temperature": 110.0},
+    }
+
+
+def test_compact_shares_url_prefixes():
+    out = compact([SAUNA_SHIKIJI, SAUNA_TERMA])
+
+    assert out["url_prefixes"] == ["https://img.sauna-ikitai.com/sauna/"]
+    assert [s["image_url"] for s in out["saunas"]] == [
+        [0, "2779_medium.jpg"],
+        [0, "1821_medium.jpg"],
+    ]
+    assert "lat" not in out["saunas"][1]
+
+
+def test_share_google_photo_url_prefixes():
+    photo_url = (
+        "https://maps.googleapis.com/maps/api/place/photo"
+        "?maxwidth=400&photoreference={}&key=API_KEY"
+    )
+    records = [{"image_url": photo_url.format(ref)} for ref in ["AAA", "BBB"]]
+
+    url_prefixes, shared = share_url_prefixes(records)
+
+    assert url_prefixes == [
+        "https://maps.googleapis.com/maps/api/place/photo"
+        "?maxwidth=400&photoreference="
+    ]
+    assert [r["image_url"] for r in shared] == [
+        [0, "AAA&key=API_KEY"],
+        [0, "BBB&key=API_KEY"],
+    ]
+
+
+class TestSearchSaunaFormat:
+    @pytest.fixture(autouse=True)
+    def mock_search_sauna(self, mocker):
+        mocker.patch(
+            "smart_sauna_map.api._search_sauna",
+            return_value=[SAUNA_SHIKIJI, SAUNA_TERMA],
+        )
+
+    def test_default(self):
+        response = app.test_client().post("/search_sauna", json={"keyword": "静岡"})
+
+        assert response.get_json()[0]["womans_room"] == {
+            "sauna_temperature": 0.0,
+            "mizuburo_temperature": 0.0,
+        }
+
+    def test_compact(self):
+        response = app.test_client().post(
+            "/search_sauna", json={"keyword": "静岡", "compact": True}
+        )
+
+        assert response.get_json() == compact([SAUNA_SHIKIJI, SAUNA_TERMA])
+
+    def test_msgpack(self):
+        msgpack = pytest.importorskip("msgpack")
+        response = app.test_client().post(
+            "/search_sauna",
+            json={"keyword": "静岡", "compact": True},
+            headers={"Accept": "application/x-msgpack"},
+        )
+
+        assert response.mimetype == "application/x-msgpack"
+        assert msgpack.unpackb(response.data) == compact([SAUNA_SHIKIJI, SAUNA_TERMA])
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+from dataclasses import replace
+
+import pytest
+from factories import sauna
+
+from smart_sauna_map.api import app
+from smart_sauna_map.snapshots import SnapshotStore, diff, version_of
+
+
+def record(sauna_id: int, ikitai: int = 100) -> dict:
+    return {"sauna_id": sauna_id, "ikitai": ikitai}
+
+
+def test_version_of():
+    assert version_of([record(1)]) == version_of([record(1)])
+    assert version_of([record(1)]) != version_of([record(1, ikitai=101)])
+
+
+def test_diff():
+    base = {1: record(1), 2: record(2), 3: record(3)}
+
+    assert diff(base, [record(1), record(2, ikitai=200), record(4)]) == {
+        "added": [record(4)],
+        "changed": [record(2, ikitai=200)],
+        "removed": [3],
+    }
+
+
+def test_store_evicts_oldest_snapshot():
+    store = SnapshotStore(maxsize=2)
+    first = store.put([record(1)])
+    store.put([record(2)])
+    store.put([record(3)])
+
+    assert store.get(first) is None
+    assert store.delta(first, [record(1)])["base"] is None
+
+
+class TestSearchSaunaDelta:
+    def post(self, json):
+        return app.test_client().post("/search_sauna", json=json)
+
+    @pytest.fixture
+    def search_sauna(self, mocker):
+        return mocker.patch("smart_sauna_map.api._search_sauna")
+
+    def test_delta(self, search_sauna):
+        search_sauna.return_value = [sauna(1), sauna(2)]
+        version = self.post({"keyword": "新宿"}).headers["X-Result-Version"]
+
+        search_sauna.return_value = [replace(sauna(2), ikitai=200), sauna(3)]
+        response = self.post({"keyword": "新宿", "since": version})
+        delta = response.get_json()
+
+        assert delta["base"] == version
+        assert delta["version"] == response.headers["X-Result-Version"]
+        assert [s["sauna_id"] for s in delta["added"]] == [3]
+        assert [s["ikitai"] for s in delta["changed"]] == [200]
+        assert delta["removed"] == [1]
+
+    def test_unchanged(self, search_sauna):
+        search_sauna.return_value = [sauna(1), sauna(2)]
+        version = self.post({"keyword": "新宿"}).headers["X-Result-Version"]
+        delta = self.post({"keyword": "新宿", "since": version}).get_json()
+
+        assert delta["version"] == version
+        assert delta["added"] == delta["changed"] == delta["removed"] == []
+
+    def test_unknown_base(self, search_sauna):
+        search_sauna.return_value = [sauna(1), sauna(2)]
+        delta = self.post({"keyword": "新宿", "since": "unknown"}).get_json()
+
+        assert delta["base"] is None
+        assert [s["sauna_id"] for s in delta["added"]] == [1, 2]
+
+    def test_compact_delta(self, search_sauna):
+        search_sauna.return_value = [sauna(1)]
+        version = self.post({"keyword": "新宿"}).headers["X-Result-Version"]
+
+        search_sauna.return_value = [sauna(1), sauna(2)]
+        delta = self.post(
+            {"keyword": "新宿", "since": version, "compact": True}
+        ).get_json()
+
+        assert delta["url_prefixes"] == ["https://img.sauna-ikitai.com/sauna/"]
+        assert delta["added"][0]["image_url"] == [0, "2_medium.jpg"]
+        assert "description" not in delta["added"][0]
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+
+from smart_sauna_map.searchers.registry import get_searcher
+from smart_sauna_map.searchers.sauna_ikitai_searcher import SaunaIkitaiSearcher
+from smart_sauna_map.startup import HEAVY_MODULES, measure_import_time
+
+
+def test_api_does_not_import_heavy_modules():
+    import_times = measure_import_time("smart_sauna_map.api")
+    modules = {t.module for t in import_times}
+
+    assert import_times[-1].module == "smart_sauna_map.api"
+    assert not modules & set(HEAVY_MODULES)
+    assert "smart_sauna_map.searchers.sauna_ikitai_searcher" not in modules
+
+
+def test_get_searcher():
+    searcher = get_searcher("SaunaIkitaiSearcher")
+
+    assert isinstance(searcher, SaunaIkitaiSearcher)
+    assert get_searcher("SaunaIkitaiSearcher") is searcher
+    assert get_searcher("unknown") is searcher
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+from dataclasses import replace
+
+import pytest
+from factories import sauna
+
+from smart_sauna_map.api import app
+from smart_sauna_map.catalog import SaunaCatalog
+from smart_sauna_map.tiles import INDIVIDUAL_ZOOM, TileIndex, tile_of
+
+TERMA = sauna(1821, 35.6949, 139.7030, ikitai=3366)
+SOLA_SPA = sauna(2, 35.6956, 139.7019, ikitai=1000)
+SHIKIJI = sauna(2779, 34.950765, 138.413977, ikitai=8949)
+
+
+@pytest.fixture
+def catalog() -> SaunaCatalog:
+    catalog = SaunaCatalog()
+    catalog.upsert([TERMA, SOLA_SPA, SHIKIJI])
+    return catalog
+
+
+@pytest.fixture
+def tiles(catalog) -> TileIndex:
+    tiles = TileIndex()
+    catalog.add_index(tiles)
+    return tiles
+
+
+def test_tile_of():
+    assert tile_of(35.6949, 139.7030, 0) == (0, 0)
+    assert tile_of(35.6949, 139.7030, 10) == (909, 403)
+
+
+def test_clusters_at_low_zoom(tiles):
+    tile = tiles.tile(0, 0, 0)
+
+    assert sorted(c["count"] for c in tile["clusters"]) == [3]
+    assert tile["clusters"][0]["max_ikitai"] == 8949
+    assert tile["saunas"] == []
+
+
+def test_clusters_split_as_zooming_in(tiles):
+    x, y = tile_of(TERMA.lat, TERMA.lng, 8)
+    (cluster,) = tiles.tile(8, x, y)["clusters"]
+
+    assert cluster["count"] == 2
+    assert cluster["lat"] == pytest.approx((TERMA.lat + SOLA_SPA.lat) / 2)
+    assert cluster["max_ikitai"] == 3366
+
+
+def test_saunas_at_high_zoom(tiles):
+    z = INDIVIDUAL_ZOOM + 2
+    tile = tiles.tile(z, *tile_of(TERMA.lat, TERMA.lng, z))
+
+    assert tile["clusters"] == []
+    assert [s["sauna_id"] for s in tile["saunas"]] == [1821]
+
+
+def test_moved_sauna_invalidates_tiles(catalog, tiles):
+    x, y = tile_of(TERMA.lat, TERMA.lng, 8)
+    assert tiles.tile(8, x, y)["clusters"][0]["count"] == 2
+
+    catalog.upsert([replace(SOLA_SPA, lat=SHIKIJI.lat, lng=SHIKIJI.lng)])
+
+    assert tiles.tile(8, x, y)["clusters"][0]["count"] == 1
+    assert tiles.tile(8, x, y)["clusters"][0]["max_ikitai"] == 3366
+    (cluster,) = tiles.tile(0, 0, 0)["clusters"]
+    assert cluster["count"] == 3
+
+
+def test_changed_ikitai_updates_max(catalog, tiles):
+    tiles.tile(0, 0, 0)
+    catalog.upsert([replace(SHIKIJI, ikitai=10)])
+
+    assert tiles.tile(0, 0, 0)["clusters"][0]["max_ikitai"] == 3366
+
+
+def test_tile_cache_is_bounded(catalog):
+    tiles = TileIndex(cache_size=2)
+    catalog.add_index(tiles)
+    for i in range(1000):
+        tiles.tile(22, i, 1)
+    for z in range(4):
+        tiles.tile(z, *tile_of(TERMA.lat, TERMA.lng, z))
+
+    assert len(tiles._tiles) == 2
+
+
+def test_tile_does_not_exist(tiles):
+    with pytest.raises(ValueError):
+        tiles.tile(1, 2, 0)
+
+
+class TestTileEndpoint:
+    def test(self, mocker, tiles):
+        mocker.patch("smart_sauna_map.api.tiles", tiles)
+        response = app.test_client().get("/tiles/0/0/0")
+
+        assert response.status_code == 200
+        assert response.get_json()["clusters"][0]["count"] == 3
+
+    def test_404(self):
+        response = app.test_client().get("/tiles/1/2/0")
+
+        assert response.status_code == 404
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+import gzip
+import multiprocessing
+
+import pytest
+from requests.exceptions import HTTPError
+
+from smart_sauna_map.geocoding import geocode
+from smart_sauna_map.searchers.sauna_ikitai_searcher import _request
+from smart_sauna_map.upstream import ReplayMissError, Transport, UpstreamArchive
+
+LAT_LNG_SHINJUKU = {"lat": 35.6938253, "lng": 139.7033559}
+LAT_LNG_SHIBUYA = {"lat": 35.6580339, "lng": 139.7016358}
+LAT_LNG_IKEBUKURO = {"lat": 35.7295028, "lng": 139.7109001}
+
+CORRUPT_TAILS = [
+    gzip.compress(b'{"key": "geocode:{}"}\n')[:-5],  # Truncated member.
+    b"\x1f\x8b\x08\x00garbage",  # Corrupt member.
+    gzip.compress(b'{"key": "geocode:{"\n'),  # Truncated line.
+]
+
+
+@pytest.fixture
+def archive_path(tmp_path) -> str:
+    return str(tmp_path / "upstream.jsonl.gz")
+
+
+def live(response):
+    calls = []
+
+    def call():
+        calls.append(response)
+        return response
+
+    call.calls = calls
+    return call
+
+
+def test_record_and_replay(archive_path):
+    live_geocode = live(LAT_LNG_SHINJUKU)
+    Transport("record", archive_path).call("geocode", {"query": "新宿"}, live_geocode)
+
+    replayed = Transport("replay", archive_path).call(
+        "geocode", {"query": "新宿"}, live({})
+    )
+
+    assert replayed == LAT_LNG_SHINJUKU
+    assert len(live_geocode.calls) == 1
+
+
+def test_replay_miss(archive_path):
+    with pytest.raises(ReplayMissError):
+        Transport("replay", archive_path).call("geocode", {"query": "新宿"}, live({}))
+
+
+def test_fallback(archive_path):
+    transport = Transport("fallback", archive_path)
+    live_geocode = live(LAT_LNG_SHINJUKU)
+
+    assert (
+        transport.call("geocode", {"query": "新宿"}, live_geocode) == LAT_LNG_SHINJUKU
+    )
+    assert (
+        transport.call("geocode", {"query": "新宿"}, live_geocode) == LAT_LNG_SHINJUKU
+    )
+    assert len(live_geocode.calls) == 1
+
+
+def test_latency(mocker, archive_path):
+    sleep = mocker.patch("smart_sauna_map.upstream.time.sleep")
+    Transport("record", archive_path).call("geocode", {"query": "新宿"}, live({}))
+
+    Transport("replay", archive_path, latency=0.25).call(
+        "geocode", {"query": "新宿"}, live({})
+    )
+    Transport("replay", archive_path, latency=None).call(
+        "geocode", {"query": "新宿"}, live({})
+    )
+
+    assert sleep.call_args_list[0].args == (0.25,)
+    assert sleep.call_args_list[1].args[0] < 0.25
+
+
+@pytest.mark.parametrize("tail", CORRUPT_TAILS)
+def test_corrupt_tail_is_skipped(archive_path, tail):
+    UpstreamArchive(archive_path).put("geocode:新宿", LAT_LNG_SHINJUKU, 0.1)
+    with open(archive_path, "ab") as f:
+        f.write(tail)
+
+    assert UpstreamArchive(archive_path).get("geocode:新宿")["response"] == (
+        LAT_LNG_SHINJUKU
+    )
+
+
+@pytest.mark.parametrize("tail", CORRUPT_TAILS)
+def test_put_after_corrupt_tail(archive_path, tail):
+    UpstreamArchive(archive_path).put("geocode:新宿", LAT_LNG_SHINJUKU, 0.1)
+    with open(archive_path, "ab") as f:
+        f.write(tail)
+    UpstreamArchive(archive_path).put("geocode:渋谷", LAT_LNG_SHIBUYA, 0.1)
+    UpstreamArchive(archive_path).put("geocode:池袋", LAT_LNG_IKEBUKURO, 0.1)
+
+    archive = UpstreamArchive(archive_path)
+    assert archive.get("geocode:新宿")["response"] == LAT_LNG_SHINJUKU
+    assert archive.get("geocode:渋谷")["response"] == LAT_LNG_SHIBUYA
+    assert archive.get("geocode:池袋")["response"] == LAT_LNG_IKEBUKURO
+
+
+def record(archive_path, worker):
+    archive = UpstreamArchive(archive_path)
+    for i in range(50):
+        archive.put(f"geocode:{worker}-{i}", {"lat": i, "padding": "x" * 4096}, 0.1)
+
+
+def test_concurrent_writers(archive_path):
+    processes = [
+        multiprocessing.Process(target=record, args=(archive_path, worker))
+        for worker in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    archive = UpstreamArchive(archive_path)
+    assert all(
+        archive.get(f"geocode:{worker}-{i}") is not None
+        for worker in range(4)
+        for i in range(50)
+    )
+
+
+def test_invalid_mode(archive_path):
+    with pytest.raises(ValueError):
+        Transport("offline", archive_path)
+
+
+class TestUpstreamCallSites:
+    @pytest.fixture
+    def transport(self, mocker, archive_path) -> Transport:
+        transport = Transport("replay", archive_path)
+        mocker.patch("smart_sauna_map.upstream.transport", transport)
+        return transport
+
+    def test_geocode(self, transport):
+        key = transport.key("geocode", {"query": "新宿 リプレイ"})
+        transport.archive.put(key, LAT_LNG_SHINJUKU, 0.0)
+
+        assert geocode("新宿 リプレイ") == LAT_LNG_SHINJUKU
+
+    @pytest.mark.parametrize("status_code", [200, 404])
+    def test_sauna_ikitai(self, transport, status_code):
+        url = "https://sauna-ikitai.com/search"
+        transport.archive.put(
+            transport.key(
+                "sauna-ikitai", {"url": url, "payload": {"keyword": "しきじ"}}
+            ),
+            {"url": url, "status_code": status_code, "reason": "", "text": "しきじ"},
+            0.0,
+        )
+
+        if status_code == 200:
+            assert _request("しきじ") == "しきじ"
+        else:
+            with pytest.raises(HTTPError):
+                _request("しきじ")
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from smart_sauna_map.api import app
+from smart_sauna_map.warmup import HotQuery, WarmUp, load_hot_queries
+
+
+def read_html(filename):
+    with open(f"./tests/data/{filename}.html", "r") as f:
+        text = f.read()
+    return text
+
+
+def test_load_hot_queries(tmp_path):
+    path = tmp_path / "hot_keywords.jsonl"
+    path.write_text(
+        "# hot keywords\n"
+        '{"keyword": "新宿", "searcher": "GoogleMapSearcher"}\n'
+        "\n"
+        "しきじ\n"
+        "しきじ\n"
+    )
+
+    assert load_hot_queries(str(path)) == [
+        HotQuery(keyword="新宿", searcher="GoogleMapSearcher"),
+        HotQuery(keyword="しきじ", searcher="SaunaIkitaiSearcher"),
+    ]
+
+
+def test_status_is_reported_after_warm_up():
+    def search(query):
+        if query.keyword == "error":
+            raise ValueError
+
+    warm_up = WarmUp([HotQuery("新宿"), HotQuery("error")], search=search).start()
+
+    assert warm_up.wait(timeout=5.0)
+    status = warm_up.status()
+    assert status["finished"]
+    assert (status["total"], status["completed"], status["failed"]) == (2, 1, 1)
+
+
+@pytest.mark.parametrize(
+    "content", [None, '{"keyword": "新宿"\n', '{"searcher": "GoogleMapSearcher"}\n']
+)
+def test_unreadable_hot_keyword_file(tmp_path, content):
+    path = tmp_path / "hot_keywords.jsonl"
+    if content is not None:
+        path.write_text(content)
+
+    warm_up = WarmUp.from_file(str(path))
+
+    assert warm_up.queries == []
+    assert warm_up.status()["error"]
+    assert warm_up.start().wait(timeout=5.0)
+
+
+def test_empty_warm_up_finishes():
+    assert WarmUp.from_file(None).start().wait(timeout=5.0)
+
+
+def test_warm_up_populates_search_cache(mocker):
+    request = mocker.patch(
+        "smart_sauna_map.searchers.sauna_ikitai_searcher._request",
+        return_value=read_html("shikiji"),
+    )
+    mocker.patch(
+        "smart_sauna_map.searchers.sauna_ikitai_searcher.geocode",
+        return_value={"lat": 34.950765, "lng": 138.413977},
+    )
+
+    assert WarmUp([HotQuery("ウォームアップ")]).start().wait(timeout=5.0)
+    response = app.test_client().post(
+        "/search_sauna", json={"keyword": "ウォームアップ"}
+    )
+
+    assert response.get_json()[0]["name"] == "サウナしきじ"
+    request.assert_called_once()
+
+
+def test_import_does_not_start_warm_up():
+    from smart_sauna_map.api import warm_up
+
+    assert warm_up._thread is None
+
+
+def test_status_endpoint():
+    response = app.test_client().get("/status")
+
+    assert response.status_code == 200
+    assert response.get_json()["warmup"]["total"] == 0